@@ -4,7 +4,6 @@ import argparse
 import sys
 
 from ynab_utils import __version__
-from ynab_utils.dupes import detect_duplicates
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -61,6 +60,12 @@ def create_parser() -> argparse.ArgumentParser:
         choices=["text", "json"],
         help="Output format (default: text)",
     )
+    dupes_parser.add_argument(
+        "--json-indent",
+        type=int,
+        default=None,
+        help="Indent JSON output by this many spaces (default: compact)",
+    )
 
     return parser
 
@@ -75,7 +80,10 @@ def main() -> int:
         return 0
 
     if args.command == "detect-dupes":
-        return detect_duplicates(args.file, args.days, args.confidence, args.start_date, args.output)
+        # Imported here so --help and --version don't load the matching and parsing code
+        from ynab_utils.dupes import detect_duplicates
+
+        return detect_duplicates(args.file, args.days, args.confidence, args.start_date, args.output, args.json_indent)
 
     return 0
 
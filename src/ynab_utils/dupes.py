@@ -2,14 +2,45 @@
 
 import csv
 import json
+import re
 import sys
-from dataclasses import dataclass
+from collections import defaultdict, deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
+from decimal import Decimal
 from difflib import SequenceMatcher
+from functools import cache
+from itertools import chain, repeat
+from operator import itemgetter
 from pathlib import Path
 
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # Optional speedup, fall back to difflib
+    fuzz = process = None
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # Optional speedup, fall back to json
+    orjson = None
+
+# YNAB export columns read by read_transactions, in unpacking order
+_CSV_COLUMNS = ("Date", "Account", "Payee", "Memo", "Outflow", "Inflow")
+
+# Currency symbols and thousands separators removed from amounts in a single pass
+_CURRENCY_STRIP = str.maketrans("", "", "$,")
+
+# Accepted date and (cleaned) amount formats, checked before parsing
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}", re.ASCII)
+_AMOUNT_RE = re.compile(r"[-+]?(\d+(\.\d*)?|\.\d+)", re.ASCII)
+
+# Characters the json module escapes by default but orjson writes raw
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7e]")
+
+
+@dataclass(slots=True)
 class Transaction:
     """Represents a YNAB transaction."""
 
@@ -19,6 +50,15 @@ class Transaction:
     amount: float
     memo: str
     row_number: int
+    payee_lower: str = field(init=False, repr=False, compare=False)
+    date_ord: int = field(init=False, repr=False, compare=False)
+    amount_cents: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Cache the normalized payee, date ordinal, and integer cents used for matching."""
+        self.payee_lower = self.payee.lower().strip()
+        self.date_ord = self.date.toordinal()
+        self.amount_cents = round(self.amount * 100)
 
     def __str__(self) -> str:
         """Format transaction for display."""
@@ -26,7 +66,7 @@ class Transaction:
         return f"Row {self.row_number}: {self.date.strftime('%Y-%m-%d')} | " f"{self.payee:30s} | {sign}${abs(self.amount):.2f}"
 
 
-@dataclass
+@dataclass(slots=True)
 class DuplicateMatch:
     """Represents a potential duplicate transaction pair."""
 
@@ -36,36 +76,59 @@ class DuplicateMatch:
     reason: str
 
 
+def _parse_date(value: str) -> datetime | None:
+    """Parse a YYYY-MM-DD date, or return None if it isn't one."""
+    # Most bad dates fail the regex, which is cheaper than raising from the parser
+    if not _DATE_RE.fullmatch(value):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:  # Well-formed but impossible, like 2025-02-30
+        return None
+
+
+def _to_cents(value: str) -> int:
+    """Convert a cleaned numeric string to integer cents, or 0 if it isn't a number."""
+    if not _AMOUNT_RE.fullmatch(value):
+        return 0
+    return round(Decimal(value) * 100)
+
+
 def parse_amount(outflow: str, inflow: str) -> float:
     """Parse amount from outflow/inflow columns.
 
-    Outflows are negative, inflows are positive.
+    Outflows are negative, inflows are positive. Values are combined in exact
+    integer cents, so equal amounts always parse to equal floats.
     """
-    outflow_val = 0.0
-    inflow_val = 0.0
+    outflow_cents = 0
+    inflow_cents = 0
 
     if outflow and outflow.strip():
         # Remove currency symbols and commas
-        cleaned = outflow.strip().replace("$", "").replace(",", "")
-        try:
-            outflow_val = float(cleaned)
-        except ValueError:
-            pass
+        cleaned = outflow.strip().translate(_CURRENCY_STRIP)
+        outflow_cents = _to_cents(cleaned)
 
     if inflow and inflow.strip():
-        cleaned = inflow.strip().replace("$", "").replace(",", "")
-        try:
-            inflow_val = float(cleaned)
-        except ValueError:
-            pass
+        cleaned = inflow.strip().translate(_CURRENCY_STRIP)
+        inflow_cents = _to_cents(cleaned)
 
     # Outflows are negative, inflows are positive
-    return inflow_val - outflow_val
+    return (inflow_cents - outflow_cents) / 100
 
 
-def read_transactions(file_path: str) -> list[Transaction]:
-    """Read transactions from YNAB CSV export."""
-    transactions = []
+def iter_transactions(
+    file_path: str,
+    start_date: datetime | None = None,
+    counts: dict[str, int] | None = None,
+) -> Iterator[Transaction]:
+    """Stream transactions from YNAB CSV export one row at a time.
+
+    Transactions dated before start_date are skipped. If a counts dict is given, once
+    the file is exhausted counts["read"] holds the number of valid transactions before
+    that filter and counts["loaded"] the number yielded.
+    """
+    loaded_count = 0
+    read_count = 0
     path = Path(file_path)
 
     if not path.exists():
@@ -74,56 +137,199 @@ def read_transactions(file_path: str) -> list[Transaction]:
 
     try:
         with path.open("r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for idx, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
-                date_str = row.get("Date", "").strip()
+            reader = csv.reader(f)
+            header = next(reader, [])
+            width = len(header)
+
+            # Look up columns by header name once, instead of building a dict per row.
+            # Missing columns point one past the header, at a blank cell padded onto each row.
+            columns = {name: i for i, name in enumerate(header)}
+            get_fields = itemgetter(*(columns.get(name, width) for name in _CSV_COLUMNS))
+
+            # Blank lines are skipped without counting, like csv.DictReader
+            for idx, row in enumerate(filter(None, reader), start=2):  # Start at 2 (header is row 1)
+                if len(row) == width:
+                    row.append("")
+                else:
+                    row = row[:width] + [""] * (width + 1 - min(len(row), width))
+                date_str, account, payee, memo, outflow, inflow = get_fields(row)
+
+                date_str = date_str.strip()
                 if not date_str:
                     continue
 
-                try:
-                    date = datetime.strptime(date_str, "%Y-%m-%d")
-                except ValueError:
+                date = _parse_date(date_str)
+                if date is None:
                     print(
                         f"Warning: Invalid date format at row {idx}: {date_str}",
                         file=sys.stderr,
                     )
                     continue
 
-                amount = parse_amount(row.get("Outflow", ""), row.get("Inflow", ""))
+                read_count += 1
+                if start_date and date < start_date:
+                    continue
+
+                amount = parse_amount(outflow, inflow)
 
                 transaction = Transaction(
-                    account=row.get("Account", "").strip(),
+                    account=account.strip(),
                     date=date,
-                    payee=row.get("Payee", "").strip(),
+                    payee=payee.strip(),
                     amount=amount,
-                    memo=row.get("Memo", "").strip(),
+                    memo=memo.strip(),
                     row_number=idx,
                 )
-                transactions.append(transaction)
+                loaded_count += 1
+                yield transaction
 
     except Exception as e:
         print(f"Error reading file: {e}", file=sys.stderr)
         sys.exit(1)
 
-    return transactions
+    if counts is not None:
+        counts["read"] = read_count
+        counts["loaded"] = loaded_count
+
+
+def read_transactions(
+    file_path: str,
+    start_date: datetime | None = None,
+    counts: dict[str, int] | None = None,
+) -> list[Transaction]:
+    """Read transactions from YNAB CSV export.
+
+    Takes the same filtering and counting arguments as iter_transactions.
+    """
+    return list(iter_transactions(file_path, start_date, counts))
 
 
 def fuzzy_match_payee(payee1: str, payee2: str, threshold: float = 0.8) -> bool:
     """Check if two payee names are a fuzzy match."""
-    if not payee1 or not payee2:
-        return False
-
     # Normalize for comparison
-    p1 = payee1.lower().strip()
-    p2 = payee2.lower().strip()
+    return _fuzzy_match_normalized(payee1.lower().strip(), payee2.lower().strip(), threshold)
+
+
+def _fuzzy_match_normalized(p1: str, p2: str, threshold: float = 0.8) -> bool:
+    """Check if two already lowercased and stripped payee names are a fuzzy match."""
+    if not p1 or not p2:
+        return False
 
     # Exact match
     if p1 == p2:
         return True
 
-    # Fuzzy match using SequenceMatcher
-    ratio = SequenceMatcher(None, p1, p2).ratio()
-    return ratio >= threshold
+    if not _lengths_can_match(len(p1), len(p2), threshold):
+        return False
+
+    # Order the pair so (a, b) and (b, a) share one cached result
+    if p1 > p2:
+        p1, p2 = p2, p1
+    return _fuzzy_match_cached(p1, p2, threshold)
+
+
+@cache
+def _fuzzy_match_cached(p1: str, p2: str, threshold: float) -> bool:
+    """Check if two normalized, differing payee names reach the threshold."""
+    # Reject early with RapidFuzz when installed. fuzz.ratio is also 2*M/T, but counts M
+    # as the longest common subsequence, which is never less than the matching blocks
+    # SequenceMatcher counts. It is an upper bound on the ratio rather than the same
+    # score, so SequenceMatcher still decides every pair that gets past it.
+    if fuzz is not None:
+        cutoff = _rapidfuzz_cutoff(threshold)
+        if fuzz.ratio(p1, p2, score_cutoff=cutoff) < cutoff:
+            return False
+
+    # Fuzzy match using SequenceMatcher. real_quick_ratio is the length bound already
+    # checked by the caller; quick_ratio is a tighter upper bound from shared
+    # characters, so the full ratio only runs on pairs that could still reach it.
+    matcher = SequenceMatcher(None, p1, p2, autojunk=False)
+    return matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold
+
+
+def _rapidfuzz_cutoff(threshold: float) -> float:
+    """Convert a ratio threshold to a RapidFuzz score cutoff for rejecting pairs early.
+
+    The cutoff sits just below the threshold, so rounding on RapidFuzz's 0-100 scale
+    never rejects a pair that SequenceMatcher scores exactly at the threshold.
+    """
+    return max(0.0, threshold * 100 - 1e-6)
+
+
+def _lengths_can_match(len1: int, len2: int, threshold: float) -> bool:
+    """Check if payees of these lengths could reach the fuzzy match threshold.
+
+    Both similarity ratios are 2*M/T with M at most the shorter length, so this is
+    an upper bound on the ratio that rules out most dissimilar pairs without scoring.
+    """
+    return 2.0 * min(len1, len2) / (len1 + len2) >= threshold
+
+
+def _payee_pair(p1: str, p2: str) -> tuple[str, str]:
+    """Return two payee names as an order-independent pair."""
+    return (p1, p2) if p1 <= p2 else (p2, p1)
+
+
+def fuzzy_match_one_vs_many(payee: str, candidates: list[str], threshold: float = 0.8) -> list[bool]:
+    """Check one payee name against many others for fuzzy matches.
+
+    Each candidate is checked as in fuzzy_match_payee, but the comparison setup for
+    payee is built once and shared across all of them.
+    """
+    # Normalize for comparison
+    return _fuzzy_match_many(payee.lower().strip(), [c.lower().strip() for c in candidates], threshold)
+
+
+def _fuzzy_match_many(p2: str, candidates: list[str], threshold: float = 0.8) -> list[bool]:
+    """Check a normalized payee name against many normalized names for fuzzy matches."""
+    results = [False] * len(candidates)
+    if not p2:
+        return results
+
+    # Only score candidates that differ and whose lengths could reach the threshold
+    to_score = []
+    for n, p1 in enumerate(candidates):
+        if p1 == p2:
+            results[n] = True
+        elif p1 and _lengths_can_match(len(p1), len(p2), threshold):
+            to_score.append(n)
+
+    if not to_score:
+        return results
+
+    if process is not None:
+        # RapidFuzz rejects candidates in one call, as in _fuzzy_match_cached
+        cutoff = _rapidfuzz_cutoff(threshold)
+        choices = [candidates[n] for n in to_score]
+        kept = process.extract(p2, choices, scorer=fuzz.ratio, processor=None, score_cutoff=cutoff, limit=None)
+        to_score = [to_score[k] for _, _, k in kept]
+
+    # SequenceMatcher indexes seq2, so set it once and only swap seq1 per candidate
+    matcher = SequenceMatcher(None, autojunk=False)
+    matcher.set_seq2(p2)
+    for n in to_score:
+        matcher.set_seq1(candidates[n])
+        results[n] = matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold
+
+    return results
+
+
+def _fuzzy_match_pairs(pairs: set[tuple[str, str]], threshold: float = 0.8) -> set[tuple[str, str]]:
+    """Return the normalized payee pairs that are a fuzzy match.
+
+    Each distinct payee is scored against all of its candidate payees at once, so
+    payee pairs shared by many transaction pairs are only scored once.
+    """
+    # Group on the second name so it is the shared seq2, matching _fuzzy_match_cached
+    by_payee: dict[str, list[str]] = defaultdict(list)
+    for p1, p2 in pairs:
+        by_payee[p2].append(p1)
+
+    matches = set()
+    for p2, others in by_payee.items():
+        matches.update((p1, p2) for p1, matched in zip(others, _fuzzy_match_many(p2, others, threshold)) if matched)
+
+    return matches
 
 
 def calculate_confidence(t1: Transaction, t2: Transaction, days_window: int) -> tuple[int, str]:
@@ -137,20 +343,24 @@ def calculate_confidence(t1: Transaction, t2: Transaction, days_window: int) ->
     - 1: Within days window, same amount, no payee match
     """
     # Check amount match (must be exact for any duplicate)
-    if t1.amount != t2.amount:
+    if t1.amount_cents != t2.amount_cents:
         return 0, ""
 
     # Check date proximity
-    date_diff = abs((t1.date - t2.date).days)
-    same_date = date_diff == 0
-    within_window = date_diff <= days_window
-
-    if not within_window:
+    date_diff = abs(t1.date_ord - t2.date_ord)
+    if date_diff > days_window:
         return 0, ""
 
     # Check payee match
-    exact_payee = t1.payee.lower() == t2.payee.lower() if t1.payee and t2.payee else False
-    fuzzy_payee = fuzzy_match_payee(t1.payee, t2.payee) if not exact_payee else False
+    exact_payee = t1.payee_lower == t2.payee_lower if t1.payee_lower and t2.payee_lower else False
+    fuzzy_payee = _fuzzy_match_normalized(t1.payee_lower, t2.payee_lower) if not exact_payee else False
+
+    return _score_match(date_diff, exact_payee, fuzzy_payee, days_window)
+
+
+def _score_match(date_diff: int, exact_payee: bool, fuzzy_payee: bool, days_window: int) -> tuple[int, str]:
+    """Score a same-amount pair that is within the days window."""
+    same_date = date_diff == 0
 
     # Calculate confidence and reason
     if same_date and exact_payee:
@@ -159,46 +369,209 @@ def calculate_confidence(t1: Transaction, t2: Transaction, days_window: int) ->
         return 4, "Same date, amount, and fuzzy payee match"
     elif same_date:
         return 3, "Same date and amount (no payee match)"
-    elif within_window and exact_payee:
+    elif exact_payee:
         return 3, f"Within {days_window} days, amount, and exact payee match"
-    elif within_window and fuzzy_payee:
+    elif fuzzy_payee:
         return 2, f"Within {days_window} days, amount, and fuzzy payee match"
-    elif within_window:
-        return 1, f"Within {days_window} days, same amount (no payee match)"
-
-    return 0, ""
-
-
-def find_duplicates(transactions: list[Transaction], days_window: int) -> list[DuplicateMatch]:
-    """Find potential duplicate transactions."""
-    duplicates = []
-
-    # Compare each transaction with all subsequent transactions
-    for i, t1 in enumerate(transactions):
-        for t2 in transactions[i + 1 :]:
-            confidence, reason = calculate_confidence(t1, t2, days_window)
-            if confidence > 0:
-                duplicates.append(
-                    DuplicateMatch(
-                        transaction1=t1,
-                        transaction2=t2,
-                        confidence=confidence,
-                        reason=reason,
-                    )
-                )
 
-    # Sort by confidence (highest first), then by date (newest first)
-    duplicates.sort(key=lambda d: (-d.confidence, -d.transaction1.date.timestamp()))
+    return 1, f"Within {days_window} days, same amount (no payee match)"
+
+
+def _scan_bucket(bucket: list[tuple[int, int, str]], days_window: int, min_confidence: int = 1) -> list[tuple[int, int, int, str]]:
+    """Find the duplicate pairs at or above min_confidence in one group of same-amount transactions.
+
+    Transactions come in as (index, date ordinal, normalized payee) tuples and pairs
+    go out as (index1, index2, confidence, reason) tuples with index1 < index2, so
+    both are cheap to pickle when groups are scanned in worker processes.
+    """
+    bucket.sort(key=lambda entry: entry[1])
+    matches = []
+
+    def add_match(first: tuple[int, int, str], second: tuple[int, int, str], exact_payee: bool, fuzzy_payee: bool) -> None:
+        confidence, reason = _score_match(second[1] - first[1], exact_payee, fuzzy_payee, days_window)
+        if confidence >= min_confidence:
+            # Keep each pair in original input order
+            i, j = first[0], second[0]
+            matches.append((i, j, confidence, reason) if i < j else (j, i, confidence, reason))
+
+    # Group by payee so same-payee pairs (confidence 5 or 3) skip fuzzy matching entirely.
+    # Away from the same date they only reach 3, so the window can shrink for higher minimums.
+    by_payee: dict[str, list[tuple[int, int, str]]] = defaultdict(list)
+    for entry in bucket:
+        if entry[2]:
+            by_payee[entry[2]].append(entry)
+
+    exact_window = days_window if min_confidence <= 3 else 0
+    for group in by_payee.values():
+        for first, second in _window_pairs(group, exact_window):
+            add_match(first, second, True, False)
+
+    # Pairs of differing payees reach at most 4 on the same date and 2 otherwise
+    if min_confidence > 4:
+        return matches
+
+    other_window = days_window if min_confidence <= 2 else 0
+    candidates = [(a, b) for a, b in _window_pairs(bucket, other_window) if not a[2] or a[2] != b[2]]
+
+    # Score each distinct pair of differing payees once, in batches
+    fuzzy_pairs = _fuzzy_match_pairs({_payee_pair(a[2], b[2]) for a, b in candidates if a[2] and b[2]})
+    for first, second in candidates:
+        add_match(first, second, False, _payee_pair(first[2], second[2]) in fuzzy_pairs)
+
+    return matches
+
+
+def _window_pairs(entries: list[tuple[int, int, str]], days_window: int) -> Iterator[tuple[tuple[int, int, str], tuple[int, int, str]]]:
+    """Yield each pair of date-sorted (index, date ordinal, payee) entries within days_window."""
+    # Slide a window of entries no more than days_window older than the current one,
+    # so every entry is only paired with the later ones still inside its window
+    window: deque[tuple[int, int, str]] = deque()
+    for entry in entries:
+        while window and entry[1] - window[0][1] > days_window:
+            window.popleft()
+        for other in window:
+            yield other, entry
+        window.append(entry)
+
+
+def find_duplicates(
+    transactions: Iterable[Transaction],
+    days_window: int,
+    min_confidence: int = 1,
+    workers: int = 1,
+) -> list[DuplicateMatch]:
+    """Find potential duplicate transactions with at least min_confidence.
+
+    Transactions are consumed in a single pass, so a stream from iter_transactions
+    can be passed in directly. Input order isn't assumed to be by date, so every
+    transaction is held until the input is exhausted.
+
+    With workers above 1, same-amount groups are scanned in that many worker
+    processes. On platforms that spawn workers (macOS, Windows) the calling script
+    is re-imported in each one, so it needs an if __name__ == "__main__" guard.
+    """
+    # Duplicates must share an amount, so group transaction indexes by amount in cents
+    indexed: list[Transaction] = []
+    buckets: dict[int, list[int]] = defaultdict(list)
+    for idx, t in enumerate(transactions):
+        indexed.append(t)
+        buckets[t.amount_cents].append(idx)
+
+    # Only amounts shared by more than one transaction can hold a duplicate
+    groups = [bucket for bucket in buckets.values() if len(bucket) > 1]
+    del buckets
+
+    # Scan entries are built one group at a time as the groups are scanned
+    scans = ([(idx, indexed[idx].date_ord, indexed[idx].payee_lower) for idx in group] for group in groups)
+
+    # Groups are independent, so they can be scanned in worker processes
+    if workers > 1:
+        chunksize = max(1, len(groups) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_scan_bucket, scans, repeat(days_window), repeat(min_confidence), chunksize=chunksize))
+    else:
+        results = [_scan_bucket(scan, days_window, min_confidence) for scan in scans]
+
+    # Pairs stay plain tuples until now, so only reported pairs become DuplicateMatch objects
+    duplicates = [
+        DuplicateMatch(
+            transaction1=indexed[i],
+            transaction2=indexed[j],
+            confidence=confidence,
+            reason=reason,
+        )
+        for i, j, confidence, reason in sorted(chain.from_iterable(results))
+    ]
+
+    # Sort by confidence (highest first), then by date (newest first), then by row
+    duplicates.sort(key=lambda d: (-d.confidence, -d.transaction1.date_ord, d.transaction1.row_number, d.transaction2.row_number))
 
     return duplicates
 
 
+def _transaction_to_dict(t: Transaction) -> dict:
+    """Convert a transaction to its JSON output form."""
+    return {
+        "row": t.row_number,
+        "date": t.date.strftime("%Y-%m-%d"),
+        "payee": t.payee,
+        "amount": t.amount,
+        "account": t.account,
+        "memo": t.memo,
+    }
+
+
+def _escape_non_ascii(match: re.Match) -> str:
+    """Escape one character as a JSON \\u sequence, as a surrogate pair outside the BMP."""
+    code = ord(match.group())
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    code -= 0x10000
+    return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
+
+
+def _dumps(obj: dict, indent: int | None = None) -> str:
+    """Serialize to ASCII-only JSON, compact when indent is None, using orjson when installed.
+
+    orjson only supports a 2-space indent, so other indents use the json module.
+    orjson writes non-ASCII characters raw, so they are escaped afterwards to give
+    the same output as the json module on any stdout encoding.
+    """
+    if orjson is not None and indent in (None, 2):
+        text = orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent == 2 else None).decode()
+        return _NON_ASCII_RE.sub(_escape_non_ascii, text)
+    if indent is None:
+        return json.dumps(obj, separators=(",", ":"))
+    return json.dumps(obj, indent=indent)
+
+
+def _print_json_report(duplicates: list[DuplicateMatch], indent: int | None = None) -> None:
+    """Print duplicate pairs as a JSON report, compact unless an indent is given.
+
+    Pairs are serialized and written one at a time, so the whole report is never
+    held in memory as a single object graph or string.
+    """
+    out = sys.stdout
+    pairs = (
+        {
+            "confidence": dup.confidence,
+            "reason": dup.reason,
+            "transaction1": _transaction_to_dict(dup.transaction1),
+            "transaction2": _transaction_to_dict(dup.transaction2),
+        }
+        for dup in duplicates
+    )
+
+    if indent is None:
+        out.write(f'{{"duplicates_found":{len(duplicates)},"pairs":[')
+        for idx, pair in enumerate(pairs):
+            if idx:
+                out.write(",")
+            out.write(_dumps(pair))
+        out.write("]}\n")
+        return
+
+    pad = " " * indent
+    out.write(f'{{\n{pad}"duplicates_found": {len(duplicates)},\n')
+    if not duplicates:
+        out.write(f'{pad}"pairs": []\n}}\n')
+        return
+
+    out.write(f'{pad}"pairs": [\n')
+    for idx, pair in enumerate(pairs):
+        # Nest the pair two levels deep; JSON strings never contain raw newlines
+        out.write(pad * 2 + _dumps(pair, indent).replace("\n", "\n" + pad * 2))
+        out.write(",\n" if idx < len(duplicates) - 1 else "\n")
+    out.write(f"{pad}]\n}}\n")
+
+
 def detect_duplicates(
     file_path: str,
     days_window: int,
     min_confidence: int = 5,
     start_date: str | None = None,
     output_format: str = "text",
+    json_indent: int | None = None,
 ) -> int:
     """Main function to detect and display duplicate transactions."""
     # Only print progress messages in text mode
@@ -208,11 +581,8 @@ def detect_duplicates(
         print(f"Minimum confidence level: {min_confidence}/5")
 
     if start_date:
-        try:
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-            if output_format == "text":
-                print(f"Filtering transactions from: {start_date}")
-        except ValueError:
+        start_dt = _parse_date(start_date)
+        if start_dt is None:
             if output_format == "text":
                 print(
                     f"Error: Invalid date format '{start_date}'. Use YYYY-MM-DD",
@@ -224,58 +594,29 @@ def detect_duplicates(
                     file=sys.stderr,
                 )
             return 1
+        if output_format == "text":
+            print(f"Filtering transactions from: {start_date}")
     else:
         start_dt = None
 
     if output_format == "text":
         print()
 
-    transactions = read_transactions(file_path)
+    # Stream transactions straight from the CSV into duplicate detection, filtering
+    # by start date while reading so skipped rows are never built
+    counts: dict[str, int] = {}
+    duplicates = find_duplicates(iter_transactions(file_path, start_dt, counts), days_window, min_confidence)
 
-    # Filter by start date if provided
     if start_dt:
-        original_count = len(transactions)
-        transactions = [t for t in transactions if t.date >= start_dt]
         if output_format == "text":
-            print(f"Loaded {len(transactions)} transactions " f"(filtered from {original_count} by start date)\n")
+            print(f"Loaded {counts['loaded']} transactions " f"(filtered from {counts['read']} by start date)\n")
     else:
         if output_format == "text":
-            print(f"Loaded {len(transactions)} transactions\n")
-
-    duplicates = find_duplicates(transactions, days_window)
-
-    # Filter by minimum confidence
-    duplicates = [d for d in duplicates if d.confidence >= min_confidence]
+            print(f"Loaded {counts['loaded']} transactions\n")
 
     if output_format == "json":
         # JSON output
-        output = {
-            "duplicates_found": len(duplicates),
-            "pairs": [
-                {
-                    "confidence": dup.confidence,
-                    "reason": dup.reason,
-                    "transaction1": {
-                        "row": dup.transaction1.row_number,
-                        "date": dup.transaction1.date.strftime("%Y-%m-%d"),
-                        "payee": dup.transaction1.payee,
-                        "amount": dup.transaction1.amount,
-                        "account": dup.transaction1.account,
-                        "memo": dup.transaction1.memo,
-                    },
-                    "transaction2": {
-                        "row": dup.transaction2.row_number,
-                        "date": dup.transaction2.date.strftime("%Y-%m-%d"),
-                        "payee": dup.transaction2.payee,
-                        "amount": dup.transaction2.amount,
-                        "account": dup.transaction2.account,
-                        "memo": dup.transaction2.memo,
-                    },
-                }
-                for dup in duplicates
-            ],
-        }
-        print(json.dumps(output, indent=2))
+        _print_json_report(duplicates, json_indent)
     else:
         # Text output
         if not duplicates:
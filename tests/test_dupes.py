@@ -1,15 +1,21 @@
 """Unit tests for duplicate detection functionality."""
 
-from datetime import datetime
+import json
+import random
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
 
+from ynab_utils import dupes
 from ynab_utils.dupes import (
     Transaction,
     calculate_confidence,
+    detect_duplicates,
     find_duplicates,
+    fuzzy_match_one_vs_many,
     fuzzy_match_payee,
+    iter_transactions,
     parse_amount,
     read_transactions,
 )
@@ -43,11 +49,42 @@ class TestParseAmount:
         assert parse_amount("invalid", "$0.00") == 0.0
         assert parse_amount("$0.00", "invalid") == 0.0
 
+    def test_parse_whole_and_signed_values(self):
+        """Test parsing amounts without cents or with an explicit sign."""
+        assert parse_amount("25", "") == -25.00
+        assert parse_amount("", "+.5") == 0.50
+        assert parse_amount("-10.00", "") == 10.00
+
     def test_parse_both_zero(self):
         """Test parsing when both values are zero."""
         assert parse_amount("$0.00", "$0.00") == 0.0
 
+    def test_parse_exact_cents(self):
+        """Test that amounts are combined exactly rather than with float arithmetic."""
+        assert parse_amount("$0.10", "$0.30") == 0.20
+        assert parse_amount("0.1", "0.3") == 0.2
+
+    def test_parse_non_finite_values(self):
+        """Test that NaN and infinity are treated as invalid."""
+        assert parse_amount("nan", "$0.00") == 0.0
+        assert parse_amount("$0.00", "inf") == 0.0
+
+
+@pytest.fixture(params=["rapidfuzz", "difflib"])
+def fuzzy_backend(request, monkeypatch):
+    """Run a test with RapidFuzz and with the difflib fallback."""
+    if request.param == "rapidfuzz":
+        pytest.importorskip("rapidfuzz")
+    else:
+        monkeypatch.setattr(dupes, "fuzz", None)
+        monkeypatch.setattr(dupes, "process", None)
+    # Cached results are specific to the backend that computed them
+    dupes._fuzzy_match_cached.cache_clear()
+    yield
+    dupes._fuzzy_match_cached.cache_clear()
 
+
+@pytest.mark.usefixtures("fuzzy_backend")
 class TestFuzzyMatchPayee:
     """Tests for fuzzy_match_payee function."""
 
@@ -72,6 +109,23 @@ class TestFuzzyMatchPayee:
         """Test fuzzy matching with dissimilar names."""
         assert fuzzy_match_payee("Starbucks", "Walmart") is False
         assert fuzzy_match_payee("Target", "CVS") is False
+        # Same letters in a different order is still a poor match
+        assert fuzzy_match_payee("Listen", "Silent") is False
+
+    def test_length_difference_near_threshold(self):
+        """Test pairs whose lengths differ but still reach the threshold."""
+        # Length ratio 7/10 is below 0.8, but the similarity is 14/17 = 0.82
+        assert fuzzy_match_payee("abcdefg", "abcdefgxyz") is True
+        # Different first characters don't rule out a close match
+        assert fuzzy_match_payee("xstarbucks", "starbucks") is True
+        # Lengths alone rule this pair out
+        assert fuzzy_match_payee("Starbucks", "Starbucks Coffee Company") is False
+
+    def test_backends_agree(self):
+        """Test that RapidFuzz and difflib give the same result where their scores differ."""
+        # RapidFuzz scores this pair 80 (longest common subsequence), difflib 0.6
+        assert fuzzy_match_payee("ddba", "dbdaba") is False
+        assert fuzzy_match_one_vs_many("dbdaba", ["ddba"]) == [False]
 
     def test_empty_payees(self):
         """Test with empty payee names."""
@@ -79,6 +133,20 @@ class TestFuzzyMatchPayee:
         assert fuzzy_match_payee("Starbucks", "") is False
         assert fuzzy_match_payee("", "") is False
 
+    def test_match_is_symmetric(self):
+        """Test that argument order doesn't change the result."""
+        assert fuzzy_match_payee("Starbucks", "Starbuck") is fuzzy_match_payee("Starbuck", "Starbucks")
+        assert fuzzy_match_payee("Walmart Store", "Walmart") is fuzzy_match_payee("Walmart", "Walmart Store")
+
+    def test_one_vs_many(self):
+        """Test matching one payee against many gives the same results as pairwise matching."""
+        candidates = ["Starbuck", "STARBUCKS", "Starbucks Coffee", "Walmart", "", "xstarbucks"]
+        expected = [fuzzy_match_payee(c, "Starbucks") for c in candidates]
+        assert fuzzy_match_one_vs_many("Starbucks", candidates) == expected
+        assert expected == [True, True, False, False, False, True]
+        assert fuzzy_match_one_vs_many("", candidates) == [False] * len(candidates)
+        assert fuzzy_match_one_vs_many("Starbucks", []) == []
+
     def test_threshold_customization(self):
         """Test custom threshold values."""
         # Low threshold should match more loosely
@@ -100,6 +168,15 @@ class TestCalculateConfidence:
         assert confidence == 5
         assert "exact payee" in reason.lower()
 
+    def test_confidence_5_case_insensitive_payee(self):
+        """Test that exact payee matching ignores case and surrounding whitespace."""
+        t1 = Transaction("Account1", datetime(2025, 11, 20), "Starbucks", -5.50, "", 1)
+        t2 = Transaction("Account1", datetime(2025, 11, 20), " STARBUCKS ", -5.50, "", 2)
+        assert t2.payee_lower == "starbucks"
+        confidence, reason = calculate_confidence(t1, t2, 2)
+        assert confidence == 5
+        assert "exact payee" in reason.lower()
+
     def test_confidence_4_same_date_fuzzy_payee(self):
         """Test confidence 4: same date, amount, fuzzy payee."""
         # Use payees that are similar enough to trigger fuzzy match (>0.8 similarity)
@@ -149,6 +226,14 @@ class TestCalculateConfidence:
         confidence, reason = calculate_confidence(t1, t2, 2)
         assert confidence == 0
 
+    def test_amount_cents(self):
+        """Test that amounts are compared as integer cents."""
+        t1 = Transaction("Account1", datetime(2025, 11, 20), "Store", 0.1 + 0.2, "", 1)
+        t2 = Transaction("Account1", datetime(2025, 11, 20), "Store", 0.3, "", 2)
+        assert t1.amount_cents == t2.amount_cents == 30
+        confidence, _ = calculate_confidence(t1, t2, 2)
+        assert confidence == 5
+
     def test_confidence_0_outside_window(self):
         """Test confidence 0: dates outside window."""
         t1 = Transaction("Account1", datetime(2025, 11, 20), "Starbucks", -5.50, "", 1)
@@ -221,11 +306,113 @@ class TestFindDuplicates:
         assert duplicates[0].confidence == 5
         assert duplicates[1].confidence == 1
 
+    def test_sorting_by_date_then_row(self):
+        """Test that equal-confidence pairs are sorted newest first, then by row."""
+        transactions = [
+            Transaction("Account", datetime(2025, 11, 20), "Store", -10.00, "", 2),
+            Transaction("Account", datetime(2025, 11, 22), "Cafe", -5.00, "", 3),
+            Transaction("Account", datetime(2025, 11, 20), "Store", -10.00, "", 4),
+            Transaction("Account", datetime(2025, 11, 22), "Cafe", -5.00, "", 5),
+            Transaction("Account", datetime(2025, 11, 20), "Shop", -7.00, "", 6),
+            Transaction("Account", datetime(2025, 11, 20), "Shop", -7.00, "", 7),
+        ]
+        duplicates = find_duplicates(transactions, 2)
+        rows = [(d.transaction1.row_number, d.transaction2.row_number) for d in duplicates]
+        assert rows == [(3, 5), (2, 4), (6, 7)]
+
+    def test_min_confidence(self):
+        """Test that pairs below min_confidence are left out."""
+        transactions = [
+            Transaction("Account", datetime(2025, 11, 20), "Store", -10.00, "", 1),
+            Transaction("Account", datetime(2025, 11, 21), "Different", -10.00, "", 2),
+            Transaction("Account", datetime(2025, 11, 22), "Exact", -20.00, "", 3),
+            Transaction("Account", datetime(2025, 11, 22), "Exact", -20.00, "", 4),
+        ]
+        duplicates = find_duplicates(transactions, 2, min_confidence=2)
+        assert [d.confidence for d in duplicates] == [5]
+
     def test_empty_transaction_list(self):
         """Test with empty transaction list."""
         duplicates = find_duplicates([], 2)
         assert len(duplicates) == 0
 
+    def test_matches_sliding_date_window(self):
+        """Test that each transaction pairs with every later one inside the date window."""
+        transactions = [
+            Transaction("Account", datetime(2025, 11, day), "Store", -10.00, "", row) for row, day in enumerate(range(15, 26), start=1)
+        ]
+        duplicates = find_duplicates(transactions, 2)
+        # Each transaction pairs with the ones 1 and 2 days later
+        assert len(duplicates) == 10 + 9
+        assert all(abs((d.transaction1.date - d.transaction2.date).days) <= 2 for d in duplicates)
+
+    def test_accepts_transaction_stream(self):
+        """Test finding duplicates straight from a transaction stream."""
+        test_file = Path(__file__).parent / "data" / "duplicates_exact_same_date.csv"
+        duplicates = find_duplicates(iter_transactions(str(test_file)), 2)
+        assert len(duplicates) == 1
+        assert duplicates[0].confidence == 5
+
+    def test_parallel_scan_matches_serial(self):
+        """Test that scanning amount groups in worker processes gives the same results."""
+        rng = random.Random(7)
+        transactions = [
+            Transaction(
+                "Account",
+                datetime(2025, 11, 1) + timedelta(days=rng.randint(0, 10)),
+                rng.choice(["Starbucks", "Starbuck", "Amazon"]),
+                rng.choice([-5.50, -10.00, -25.00, -40.00]),
+                "",
+                row,
+            )
+            for row in range(2, 42)
+        ]
+        serial = find_duplicates(transactions, 2)
+        parallel = find_duplicates(transactions, 2, workers=2)
+
+        assert parallel == serial
+
+    def test_pairs_keep_input_order(self):
+        """Test that transaction1 is always the earlier transaction in the input."""
+        transactions = [
+            Transaction("Account", datetime(2025, 11, 22), "Store", -10.00, "", 1),
+            Transaction("Account", datetime(2025, 11, 20), "Store", -10.00, "", 2),
+        ]
+        duplicates = find_duplicates(transactions, 2)
+        assert len(duplicates) == 1
+        assert duplicates[0].transaction1.row_number == 1
+        assert duplicates[0].transaction2.row_number == 2
+
+    @pytest.mark.usefixtures("fuzzy_backend")
+    def test_matches_pairwise_comparison(self):
+        """Test that results agree with comparing every transaction pair."""
+        rng = random.Random(42)
+        payees = ["Starbucks", "Starbuck", "Amazon", "Target", "Walmart", ""]
+        transactions = [
+            Transaction(
+                "Account",
+                datetime(2025, 11, 1) + timedelta(days=rng.randint(0, 20)),
+                rng.choice(payees),
+                rng.choice([-5.50, -10.00, -25.00]),
+                "",
+                row,
+            )
+            for row in range(2, 62)
+        ]
+        for days_window in (0, 2, 5):
+            for min_confidence in range(1, 6):
+                expected = {
+                    (t1.row_number, t2.row_number, calculate_confidence(t1, t2, days_window)[0])
+                    for i, t1 in enumerate(transactions)
+                    for t2 in transactions[i + 1 :]
+                    if calculate_confidence(t1, t2, days_window)[0] >= min_confidence
+                }
+                found = {
+                    (d.transaction1.row_number, d.transaction2.row_number, d.confidence)
+                    for d in find_duplicates(transactions, days_window, min_confidence)
+                }
+                assert found == expected
+
 
 class TestReadTransactions:
     """Tests for read_transactions function."""
@@ -246,6 +433,48 @@ class TestReadTransactions:
         transactions = read_transactions(str(test_file))
         assert len(transactions) == 2
 
+    def test_read_csv_with_missing_columns(self):
+        """Test that missing columns and short rows read as blank values."""
+        test_file = Path(__file__).parent / "data" / "transactions_missing_columns.csv"
+        transactions = read_transactions(str(test_file))
+        assert len(transactions) == 2
+        assert transactions[0].payee == "Store"
+        assert transactions[0].memo == ""
+        assert transactions[0].amount == -25.00
+        assert transactions[1].payee == "Cafe"
+        assert transactions[1].amount == 0.0
+        assert transactions[1].row_number == 3
+
+    def test_read_with_start_date(self):
+        """Test that transactions before the start date are skipped while reading."""
+        test_file = Path(__file__).parent / "data" / "duplicates_with_date_filter.csv"
+        counts = {}
+        transactions = read_transactions(str(test_file), datetime(2025, 11, 1), counts)
+        assert len(transactions) == 2
+        assert all(t.payee == "Recent Purchase" for t in transactions)
+        assert [t.row_number for t in transactions] == [4, 5]
+        assert counts["read"] == 4
+
+    def test_iter_transactions_streams_rows(self):
+        """Test that iter_transactions yields rows lazily and counts them once exhausted."""
+        test_file = Path(__file__).parent / "data" / "duplicates_with_date_filter.csv"
+        counts = {}
+        stream = iter_transactions(str(test_file), datetime(2025, 11, 1), counts)
+        assert next(stream).row_number == 4
+        assert counts == {}
+        assert [t.row_number for t in stream] == [5]
+        assert counts == {"read": 4, "loaded": 2}
+
+    def test_read_csv_with_invalid_dates(self, capsys):
+        """Test that rows with invalid dates are skipped with a warning."""
+        test_file = Path(__file__).parent / "data" / "transactions_with_invalid_dates.csv"
+        transactions = read_transactions(str(test_file))
+        assert [t.row_number for t in transactions] == [2, 4]
+        err = capsys.readouterr().err
+        assert "Invalid date format at row 3: 11/20/2025" in err
+        assert "Invalid date format at row 5: 20251122" in err
+        assert "Invalid date format at row 6: 2025-02-30" in err
+
     def test_read_nonexistent_file(self):
         """Test reading a file that doesn't exist."""
         with pytest.raises(SystemExit):
@@ -258,3 +487,56 @@ class TestReadTransactions:
         # Row numbers start at 2 (header is row 1)
         assert transactions[0].row_number == 2
         assert transactions[1].row_number == 3
+
+
+class TestJsonReport:
+    """Tests for JSON report output."""
+
+    @pytest.fixture(params=["orjson", "json"])
+    def json_backend(self, request, monkeypatch):
+        """Run a test with orjson and with the stdlib json fallback."""
+        if request.param == "orjson":
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr(dupes, "orjson", None)
+
+    @pytest.mark.usefixtures("json_backend")
+    @pytest.mark.parametrize("file_name", ["duplicates_with_date_filter.csv", "duplicates_non_ascii.csv", "no_duplicates.csv"])
+    @pytest.mark.parametrize("indent", [None, 0, 2, 4])
+    def test_matches_json_dumps(self, capsys, file_name, indent):
+        """Test that the streamed report matches json.dumps of the whole report."""
+        test_file = Path(__file__).parent / "data" / file_name
+        assert detect_duplicates(str(test_file), 2, output_format="json", json_indent=indent) == 0
+        output = capsys.readouterr().out
+
+        duplicates = find_duplicates(read_transactions(str(test_file)), 2, min_confidence=5)
+        expected = {
+            "duplicates_found": len(duplicates),
+            "pairs": [
+                {
+                    "confidence": dup.confidence,
+                    "reason": dup.reason,
+                    "transaction1": {
+                        "row": dup.transaction1.row_number,
+                        "date": dup.transaction1.date.strftime("%Y-%m-%d"),
+                        "payee": dup.transaction1.payee,
+                        "amount": dup.transaction1.amount,
+                        "account": dup.transaction1.account,
+                        "memo": dup.transaction1.memo,
+                    },
+                    "transaction2": {
+                        "row": dup.transaction2.row_number,
+                        "date": dup.transaction2.date.strftime("%Y-%m-%d"),
+                        "payee": dup.transaction2.payee,
+                        "amount": dup.transaction2.amount,
+                        "account": dup.transaction2.account,
+                        "memo": dup.transaction2.memo,
+                    },
+                }
+                for dup in duplicates
+            ],
+        }
+        if indent is None:
+            assert output == json.dumps(expected, separators=(",", ":")) + "\n"
+        else:
+            assert output == json.dumps(expected, indent=indent) + "\n"
@@ -132,6 +132,19 @@ class TestDetectDupesIntegration:
         result = run_detect_dupes(str(test_file), "--days", "3", "--confidence", "1")
         assert result["duplicates_found"] == 1
 
+    def test_json_indent(self):
+        """Test compact JSON by default and indented JSON with --json-indent."""
+        test_file = Path(__file__).parent / "data" / "duplicates_exact_same_date.csv"
+        cmd = ["uv", "run", "ynab-utils", "detect-dupes", "--file", str(test_file), "--output", "json"]
+
+        compact = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+        assert compact.count("\n") == 1
+        assert compact.startswith('{"duplicates_found":1,')
+
+        indented = subprocess.run([*cmd, "--json-indent", "2"], capture_output=True, text=True, check=True).stdout
+        assert indented.startswith('{\n  "duplicates_found": 1,\n')
+        assert json.loads(indented) == json.loads(compact)
+
     def test_nonexistent_file(self):
         """Test error handling for nonexistent file."""
         with pytest.raises(subprocess.CalledProcessError):
@@ -142,3 +155,13 @@ class TestDetectDupesIntegration:
         test_file = Path(__file__).parent / "data" / "no_duplicates.csv"
         with pytest.raises(subprocess.CalledProcessError):
             run_detect_dupes(str(test_file), "--start-date", "invalid-date")
+
+
+class TestCliIntegration:
+    """Integration tests for top-level CLI behavior."""
+
+    def test_cli_import_is_lazy(self):
+        """Test that loading the CLI doesn't import the detect-dupes module."""
+        code = "import sys, ynab_utils.cli; print('ynab_utils.dupes' in sys.modules)"
+        result = subprocess.run(["uv", "run", "python", "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "False"